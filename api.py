@@ -1,26 +1,225 @@
 """Modulo API per le operazioni di comunicazione con il server"""
-from requests import get, exceptions
-from config import logger
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
 
+from requests import Response, Session, exceptions
+from requests.adapters import HTTPAdapter
+import metrics
+from config import (
+    logger,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    MAX_RETRIES,
+    BACKOFF_FACTOR,
+    BACKOFF_MAX,
+    BREAKER_FAILURE_RATE,
+    BREAKER_MIN_REQUESTS,
+    BREAKER_WINDOW,
+    BREAKER_RESET_TIMEOUT,
+    LAST_GOOD_MAX_ENTRIES,
+)
+from resilience import CircuitBreaker, CircuitOpenError, SingleFlight
 
+_session: Session | None = None
+_session_lock = threading.Lock()
+_retries: int = 0
+_single_flight = SingleFlight()
+_breakers: dict[str, CircuitBreaker] = {}
+_last_good: OrderedDict[str, tuple[int, any, dict[str, str]]] = OrderedDict()
+_fallbacks: int = 0
+
+
+def get_session() -> Session:
+    """Restituisce la sessione HTTP condivisa, creandola al primo utilizzo"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def reset_session() -> None:
+    """Chiude la sessione condivisa e azzera i contatori"""
+    global _session, _retries, _single_flight, _fallbacks
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _retries = 0
+        _single_flight = SingleFlight()
+        _breakers.clear()
+        _last_good.clear()
+        _fallbacks = 0
+
+
+def get_stats() -> dict[str, int]:
+    """Restituisce i contatori di riuso del pool, dei tentativi ripetuti e di resilienza"""
+    requests_count = 0
+    connections = 0
+    with _session_lock:
+        if _session is not None:
+            for adapter in set(_session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools[key]
+                    requests_count += pool.num_requests
+                    connections += pool.num_connections
+        retries = _retries
+        fallbacks = _fallbacks
+        breakers = list(_breakers.values())
+
+    return {
+        "pool_hits": requests_count - connections,
+        "pool_misses": connections,
+        "retries": retries,
+        "coalesced": _single_flight.coalesced,
+        "short_circuited": sum(breaker.short_circuited for breaker in breakers),
+        "fallbacks": fallbacks,
+        "breakers_open": sum(breaker.state != CircuitBreaker.CLOSED for breaker in breakers),
+    }
+
+
+def _backoff(attempt: int) -> None:
+    """Attende con backoff esponenziale e jitter prima di un nuovo tentativo"""
+    global _retries
+    with _session_lock:
+        _retries += 1
+    delay = min(BACKOFF_MAX, BACKOFF_FACTOR * (2 ** attempt))
+    time.sleep(random.uniform(0, delay))
+
+
+def _fetch(URL: str, headers: dict[str, str] | None = None) -> Response:
+    """Esegue la GET ripetendola su timeout ed errori 5xx transitori"""
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        try:
+            response = session.get(URL, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except exceptions.Timeout:
+            if last_attempt:
+                raise
+            logger.warning(f"Timeout su {URL}, nuovo tentativo ({attempt + 1}/{MAX_RETRIES})")
+            _backoff(attempt)
+            continue
+
+        if response.status_code >= 500 and not last_attempt:
+            logger.warning(
+                f"Errore del server ({response.status_code}) su {URL}, "
+                f"nuovo tentativo ({attempt + 1}/{MAX_RETRIES})"
+            )
+            response.close()
+            _backoff(attempt)
+            continue
+
+        return response
+
+
+@metrics.span("api.get_data")
 def get_data(URL: str) -> dict[str, any] | list[dict[str, any]]:
     """Recupera i dati dall'API"""
+    return fetch_data(URL)[1]
+
+
+@metrics.span("api.fetch_data")
+def fetch_data(URL: str, headers: dict[str, str] | None = None) -> tuple[int, any, dict[str, str]]:
+    """Esegue la richiesta e restituisce (status, dati, header); i dati sono None con 304 Not Modified
+
+    Richieste concorrenti identiche condividono un'unica chiamata al server.
+    """
+    key = (URL, tuple(sorted(headers.items())) if headers else ())
+    return _single_flight.do(key, lambda: _guarded_fetch_data(URL, headers))
+
+
+def _get_breaker(URL: str) -> CircuitBreaker:
+    """Restituisce il circuit breaker dell'host dell'URL"""
+    host = urlsplit(URL).netloc
+    with _session_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                host, BREAKER_FAILURE_RATE, BREAKER_MIN_REQUESTS, BREAKER_WINDOW, BREAKER_RESET_TIMEOUT
+            )
+        return breaker
+
+
+def _guarded_fetch_data(URL: str, headers: dict[str, str] | None) -> tuple[int, any, dict[str, str]]:
+    """Esegue la richiesta attraverso il circuit breaker, servendo l'ultimo dato valido se il circuito è aperto"""
+    global _fallbacks
+    if not URL:
+        return _fetch_data(URL, headers)
+
+    breaker = _get_breaker(URL)
+    if not breaker.allow():
+        with _session_lock:
+            last_good = _last_good.get(URL)
+            if last_good is not None:
+                _fallbacks += 1
+        if last_good is not None:
+            logger.warning(f"Server non disponibile: uso l'ultimo dato valido per {URL}")
+            return last_good
+        error_msg = f"Server non disponibile: circuito aperto per {breaker.name}"
+        logger.error(error_msg)
+        raise CircuitOpenError(error_msg)
+
+    try:
+        result = _fetch_data(URL, headers)
+    except (exceptions.Timeout, exceptions.ConnectionError):
+        breaker.record_failure()
+        raise
+    except ValueError as e:
+        cause = e.__cause__
+        if isinstance(cause, exceptions.HTTPError) and cause.response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            # 4xx o JSON non valido: il server risponde, l'errore è nella richiesta
+            breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+
+    breaker.record_success()
+    if result[0] == 200:
+        with _session_lock:
+            _last_good[URL] = result
+            _last_good.move_to_end(URL)
+            while len(_last_good) > LAST_GOOD_MAX_ENTRIES:
+                _last_good.popitem(last=False)
+    return result
+
+
+def _fetch_data(URL: str, headers: dict[str, str] | None) -> tuple[int, any, dict[str, str]]:
+    """Esegue una singola richiesta traducendo gli errori nei messaggi dell'applicazione"""
     if not URL:
         error_msg = "L'URL non può essere vuoto!"
         logger.error(error_msg)
         raise ValueError(error_msg)
     
     try:
-        response = get(URL, timeout=5)
+        response = _fetch(URL, headers)
+        metrics.record_response(response.status_code, len(response.content))
         response.raise_for_status()
-        return response.json()
+        if response.status_code == 304:
+            return response.status_code, None, response.headers
+        return response.status_code, response.json(), response.headers
 
     except exceptions.Timeout:
+        metrics.record_http_error("timeout")
         error_msg = f"Timeout: La richiesta a {URL} ha impiegato troppo tempo"
         logger.error(error_msg)
         raise
     
     except exceptions.ConnectionError:
+        metrics.record_http_error("connection")
         error_msg = f"Errore di connessione: Impossibile raggiungere {URL}"
         logger.error(error_msg)
         raise
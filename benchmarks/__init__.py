@@ -0,0 +1 @@
+"""Benchmark e server di prova locale per l'API Fake Store"""
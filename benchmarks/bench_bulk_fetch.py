@@ -0,0 +1,47 @@
+"""Benchmark del recupero concorrente per ID contro un server lento locale
+
+Uso: python -m benchmarks.bench_bulk_fetch [--ids 64] [--latency 0.05]
+"""
+import argparse
+import logging
+import time
+
+import cache
+import products
+from api import reset_session
+from benchmarks.stub_server import StubServer
+
+
+def run(ids: int, latency: float, levels: list[int]) -> None:
+    """Misura il tempo di recupero di `ids` prodotti a vari livelli di concorrenza"""
+    with StubServer(size=ids, latency=latency) as stub:
+        products.BASE_URL = stub.base_url
+        product_ids = [str(i) for i in range(1, ids + 1)]
+        baseline = None
+
+        print(f"{'CONCORRENZA':<12} {'TEMPO (s)':>10} {'SPEEDUP':>8}")
+        for concurrency in levels:
+            # Ogni livello parte a freddo: pool di connessioni e cache delle risposte vuoti
+            reset_session()
+            cache.response_cache.invalidate()
+            start = time.perf_counter()
+            results = products.get_products_by_ids(product_ids, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for result in results if result["error"])
+            baseline = baseline or elapsed
+            print(f"{concurrency:<12} {elapsed:>10.3f} {baseline / elapsed:>7.1f}x" + (f"  errori: {errors}" if errors else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    run(args.ids, args.latency, args.levels)
+
+
+if __name__ == "__main__":
+    main()
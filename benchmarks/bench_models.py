@@ -0,0 +1,68 @@
+"""Microbenchmark di memoria e throughput: dizionari per prodotto contro Product
+
+Uso: python -m benchmarks.bench_models [--sizes 10000 1000000]
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+
+from benchmarks.stub_server import make_product
+from models import product_models
+
+
+def dict_model(product: dict[str, any]) -> dict[str, any]:
+    """Percorso precedente: validazione campo per campo e un nuovo dizionario a 5 chiavi"""
+    for field in ("id", "title", "price", "category", "description"):
+        if field not in product:
+            raise KeyError(f"Campo obbligatorio mancante: {field}")
+    if not isinstance(product["category"], dict) or "name" not in product["category"]:
+        raise ValueError("Struttura category non valida")
+    return {
+        "id": product["id"],
+        "title": product["title"],
+        "price": product["price"],
+        "category": product["category"]["name"],
+        "description": product["description"],
+    }
+
+
+def measure(label: str, build, raw_products: list[dict[str, any]]) -> None:
+    """Esegue `build` e stampa tempo, throughput e memoria trattenuta dal risultato"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build(raw_products)
+    elapsed = time.perf_counter() - start
+    del result
+
+    # Seconda esecuzione sotto tracemalloc, che rallenterebbe la misura del tempo
+    gc.collect()
+    tracemalloc.start()
+    result = build(raw_products)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(result)
+    print(f"{label:<10} {count:>9} {elapsed:>9.3f} {count / elapsed:>12,.0f} {retained / count:>10.1f}")
+    del result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    # I prodotti grezzi si ripetono per non misurare la memoria dell'input
+    templates = [make_product(i) for i in range(1, 1001)]
+
+    print(f"{'PERCORSO':<10} {'PRODOTTI':>9} {'TEMPO (s)':>9} {'PRODOTTI/s':>12} {'B/PRODOTTO':>10}")
+    for size in args.sizes:
+        raw_products = [templates[i % len(templates)] for i in range(size)]
+        measure("dict", lambda items: [dict_model(p) for p in items], raw_products)
+        measure("Product", product_models, raw_products)
+
+
+if __name__ == "__main__":
+    main()
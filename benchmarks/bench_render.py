@@ -0,0 +1,58 @@
+"""Benchmark del rendering: print() per riga contro scrittura bufferizzata
+
+Uso: python -m benchmarks.bench_render [--rows 100000]
+"""
+import argparse
+import contextlib
+import logging
+import os
+import time
+
+from benchmarks.stub_server import make_product
+from models import product_models
+from render import FORMATS, write_products
+
+
+def print_per_line(products) -> None:
+    """Percorso precedente di ui.print_lista_prodotti: una print() per riga"""
+    print("\n" + "=" * 80)
+    print(f"{'ID':<5} {'TITOLO':<75}")
+    print("=" * 80)
+    count = 0
+    for product in products:
+        title = product.title
+        if len(title) > 75:
+            title = title[:72] + "..."
+        print(f"{product.id:<5} {title:<75}")
+        count += 1
+    print("=" * 80)
+    print(f"Totale prodotti: {count}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    products = product_models(make_product(i) for i in range(1, args.rows + 1))
+
+    print(f"{'PERCORSO':<16} {'BUFFER':<8} {'TEMPO (s)':>10} {'RIGHE/s':>12}")
+    # Buffer a blocchi come stdout su file o pipe, a righe come stdout su terminale
+    for label, buffering in (("blocchi", 8192), ("righe", 1)):
+        with open(os.devnull, "w", buffering=buffering) as devnull:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                print_per_line(products)
+            elapsed = time.perf_counter() - start
+            print(f"{'print per riga':<16} {label:<8} {elapsed:>10.3f} {args.rows / elapsed:>12,.0f}")
+
+            for fmt in FORMATS:
+                start = time.perf_counter()
+                write_products(products, devnull, fmt)
+                elapsed = time.perf_counter() - start
+                print(f"{fmt:<16} {label:<8} {elapsed:>10.3f} {args.rows / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Carico multi-thread contro un server che inietta guasti: coalescenza e circuit breaker
+
+Uso: python -m benchmarks.bench_resilience [--threads 32] [--requests 20]
+"""
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import api
+from benchmarks.stub_server import StubServer
+
+
+def load(base_url: str, threads: int, requests_per_thread: int, hot_ids: int) -> dict[str, any]:
+    """Ogni thread chiede a ripetizione gli stessi pochi ID; restituisce esiti e durata"""
+    outcomes = {"ok": 0, "errors": 0}
+
+    def worker(index: int) -> tuple[int, int]:
+        ok = errors = 0
+        for i in range(requests_per_thread):
+            try:
+                api.get_data(f"{base_url}/{(index + i) % hot_ids + 1}")
+                ok += 1
+            except Exception:
+                errors += 1
+        return ok, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for ok, errors in executor.map(worker, range(threads)):
+            outcomes["ok"] += ok
+            outcomes["errors"] += errors
+    outcomes["seconds"] = time.perf_counter() - start
+    return outcomes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--hot-ids", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    # Niente ritentativi e reset rapido per osservare il breaker in pochi secondi
+    api.MAX_RETRIES = 0
+    api.BREAKER_RESET_TIMEOUT = 0.5
+
+    with StubServer(size=100, latency=args.latency) as stub:
+        print(f"{'FASE':<12} {'OK':>6} {'ERRORI':>7} {'UPSTREAM':>9} {'COALESCED':>10} {'CORTOCIRC.':>11} {'FALLBACK':>9} {'TEMPO (s)':>10}")
+        for phase, down in (("sano", False), ("guasto", True), ("ripristino", False)):
+            stub.down = down
+            if phase == "ripristino":
+                time.sleep(api.BREAKER_RESET_TIMEOUT)
+            before_requests = stub.requests
+            before = api.get_stats()
+            result = load(stub.base_url, args.threads, args.requests, args.hot_ids)
+            after = api.get_stats()
+            print(
+                f"{phase:<12} {result['ok']:>6} {result['errors']:>7} {stub.requests - before_requests:>9} "
+                f"{after['coalesced'] - before['coalesced']:>10} "
+                f"{after['short_circuited'] - before['short_circuited']:>11} "
+                f"{after['fallbacks'] - before['fallbacks']:>9} {result['seconds']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
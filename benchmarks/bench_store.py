@@ -0,0 +1,44 @@
+"""Benchmark delle query sul catalogo locale indicizzato
+
+Uso: python -m benchmarks.bench_store [--size 100000]
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.stub_server import make_product
+from models import product_models
+from store import CatalogStore
+
+
+def timed(label: str, query, repeat: int = 200) -> None:
+    """Esegue la query più volte e stampa il tempo medio e il numero di risultati"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = query()
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<40} {elapsed_ms:>10.4f} {len(results):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    products = product_models(make_product(i) for i in range(1, args.size + 1))
+    start = time.perf_counter()
+    store = CatalogStore(products)
+    print(f"Indicizzazione di {len(store)} prodotti: {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'QUERY':<40} {'MEDIA (ms)':>10} {'RISULTATI':>10}")
+    timed("get(ID)", lambda: [store.get(args.size // 2)])
+    timed("search('sintetico 4242')", lambda: store.search("sintetico 4242"))
+    timed("price_range(10, 10.5)", lambda: store.price_range(10, 10.5))
+    timed("by_category('shoes')", lambda: store.by_category("shoes"), repeat=20)
+    timed("by_category('shoes', sort='-price')", lambda: store.by_category("shoes", sort="-price"), repeat=20)
+    timed("scansione lineare (titolo contiene)", lambda: [p for p in products if "4242" in p.title], repeat=20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Confronto di memoria di picco tra lista completa e iteratore paginato
+
+Uso: python -m benchmarks.bench_streaming [--size 200000] [--page-size 500]
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+
+def consume(mode: str, base_url: str, page_size: int) -> None:
+    """Scorre il catalogo nella modalità indicata e stampa tempo e RSS di picco"""
+    import logging
+    import resource
+
+    import products
+    from models import product_model
+
+    logging.disable(logging.WARNING)
+    products.BASE_URL = base_url
+
+    start = time.perf_counter()
+    first_row = None
+    count = 0
+    if mode == "full":
+        for raw_product in products.get_all_products():
+            product_model(raw_product)
+            first_row = first_row or time.perf_counter() - start
+            count += 1
+    else:
+        for _ in products.iter_products(page_size=page_size):
+            first_row = first_row or time.perf_counter() - start
+            count += 1
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<8} {count:>9} {first_row:>12.3f} {elapsed:>9.2f} {peak_mb:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--mode", choices=["full", "paged"], help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        consume(args.mode, args.base_url, args.page_size)
+        return
+
+    # Il server gira in un processo separato per non sporcare la misura della memoria
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_server", "--size", str(args.size)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        base_url = stub.stdout.readline().strip()
+        print(f"{'MODO':<8} {'PRODOTTI':>9} {'1a RIGA (s)':>12} {'TOTALE':>9} {'PICCO (MB)':>12}")
+        for mode in ("full", "paged"):
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming", "--mode", mode,
+                 "--base-url", base_url, "--page-size", str(args.page_size)],
+                check=True,
+            )
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Verifica offline della cache delle risposte: rivalidazione 304 e avvio a caldo dal disco
+
+Uso: python -m benchmarks.check_cache [--ttl 0.5]
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+import metrics
+from benchmarks.stub_server import StubServer
+from cache import ResponseCache
+
+
+def downloaded_bytes() -> int:
+    """Byte di corpo ricevuti dal server dall'attivazione delle metriche"""
+    return metrics.summary()["http"]["bytes"]
+
+
+def run(ttl: float) -> list[str]:
+    """Esegue le fasi sulla cache e restituisce le discrepanze rispetto all'atteso"""
+    failures = []
+
+    def expect(label: str, actual: any, expected: any) -> None:
+        outcome = "ok" if actual == expected else "ERRORE"
+        print(f"{label:<48} {outcome:>6}  {actual}")
+        if actual != expected:
+            failures.append(f"{label}: atteso {expected}, ottenuto {actual}")
+
+    def fetch(cache: ResponseCache) -> tuple[any, dict[str, int]]:
+        """Legge l'URL e restituisce i dati con gli incrementi di cache, server e traffico"""
+        stats, requests, not_modified, size = cache.stats(), stub.requests, stub.not_modified, downloaded_bytes()
+        data = cache.get(URL)
+        after = cache.stats()
+        delta = {key: after[key] - stats[key] for key in ("hits", "misses", "revalidated", "disk_hits")}
+        delta.update({
+            "requests": stub.requests - requests,
+            "not_modified": stub.not_modified - not_modified,
+            "bytes": downloaded_bytes() - size,
+        })
+        return data, delta
+
+    metrics.reset()
+    metrics.enable()
+    with tempfile.TemporaryDirectory() as disk_dir, StubServer(size=10) as stub:
+        URL = f"{stub.base_url}/1"
+        cache = ResponseCache(ttl=ttl, disk_dir=disk_dir)
+
+        data, delta = fetch(cache)
+        expect("prima lettura: miss e corpo scaricato", (delta["misses"], delta["requests"], delta["bytes"] > 0), (1, 1, True))
+
+        _, delta = fetch(cache)
+        expect("entro il TTL: hit senza richieste", (delta["hits"], delta["requests"]), (1, 0))
+
+        time.sleep(ttl)
+        revalidated, delta = fetch(cache)
+        expect("voce scaduta: rivalidata con 304", (delta["revalidated"], delta["not_modified"]), (1, 1))
+        expect("voce scaduta: nessun corpo scaricato", delta["bytes"], 0)
+        expect("voce scaduta: stessi dati", revalidated == data, True)
+
+        _, delta = fetch(ResponseCache(ttl=ttl, disk_dir=disk_dir))
+        expect("nuova cache sullo stesso disco: avvio a caldo", (delta["disk_hits"], delta["hits"], delta["requests"]), (1, 1, 0))
+
+        time.sleep(ttl)
+        _, delta = fetch(ResponseCache(ttl=ttl, disk_dir=disk_dir))
+        expect("avvio a caldo con voce scaduta: 304", (delta["disk_hits"], delta["revalidated"], delta["bytes"]), (1, 1, 0))
+
+        stub.update_product(1, title="Prodotto aggiornato")
+        time.sleep(ttl)
+        updated, delta = fetch(cache)
+        expect("prodotto modificato: nuovo corpo", (delta["misses"], delta["not_modified"]), (1, 0))
+        expect("prodotto modificato: dati aggiornati", updated["title"], "Prodotto aggiornato")
+    metrics.disable()
+
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttl", type=float, default=0.5, help="durata delle voci in secondi")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    failures = run(args.ttl)
+    if failures:
+        print("\n❌ CACHE NON CONFORME:", file=sys.stderr)
+        for failure in failures:
+            print(f"   {failure}", file=sys.stderr)
+        return 1
+    print("\n✅ Rivalidazione e avvio a caldo conformi", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Verifica offline della sincronizzazione incrementale contro un server locale con catalogo variabile
+
+Uso: python -m benchmarks.check_sync [--size 20]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from contextlib import closing
+
+from benchmarks.stub_server import StubServer
+from sync import CatalogSnapshot
+
+
+def tombstones(path: str) -> list[int]:
+    """ID marcati come rimossi nello snapshot, letti con una connessione separata"""
+    with closing(sqlite3.connect(path)) as conn:
+        return [row[0] for row in conn.execute("SELECT id FROM products WHERE deleted = 1 ORDER BY id")]
+
+
+def run(size: int) -> list[str]:
+    """Esegue le fasi di sincronizzazione e restituisce le discrepanze rispetto all'atteso"""
+    failures = []
+
+    def expect(label: str, actual: any, expected: any) -> None:
+        outcome = "ok" if actual == expected else "ERRORE"
+        print(f"{label:<44} {outcome:>6}  {actual}")
+        if actual != expected:
+            failures.append(f"{label}: atteso {expected}, ottenuto {actual}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, StubServer(size=size) as stub:
+        path = os.path.join(tmp_dir, "snapshot.db")
+        snapshot = CatalogSnapshot(path)
+        try:
+            stats = snapshot.sync(stub.base_url)
+            expect("sync iniziale", stats, {"status": "updated", "inserted": size, "updated": 0, "deleted": 0, "unchanged": 0})
+
+            before = stub.not_modified
+            stats = snapshot.sync(stub.base_url)
+            expect("sync senza modifiche", stats["status"], "not_modified")
+            expect("risposte 304 del server", stub.not_modified - before, 1)
+
+            new_id = size + 1
+            stub.update_product(3, title="Prodotto aggiornato")
+            stub.delete_product(5)
+            stub.update_product(new_id)
+            stats = snapshot.sync(stub.base_url)
+            expect("sync dopo modifica, rimozione e aggiunta", stats, {
+                "status": "updated", "inserted": 1, "updated": 1, "deleted": 1, "unchanged": size - 2,
+            })
+            expect("titolo aggiornato", snapshot.get(3).title, "Prodotto aggiornato")
+            expect("prodotto rimosso non servito", snapshot.get(5), None)
+            expect("prodotto aggiunto servito", snapshot.get(new_id).id, new_id)
+            expect("tombstone", tombstones(path), [5])
+            expect("prodotti attivi", len(snapshot), size)
+
+            stub.update_product(5)
+            stats = snapshot.sync(stub.base_url)
+            expect("sync dopo ripristino", stats, {
+                "status": "updated", "inserted": 1, "updated": 0, "deleted": 0, "unchanged": size,
+            })
+            expect("tombstone dopo ripristino", tombstones(path), [])
+        finally:
+            snapshot.close()
+
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    failures = run(args.size)
+    if failures:
+        print("\n❌ SINCRONIZZAZIONE NON CONFORME:", file=sys.stderr)
+        for failure in failures:
+            print(f"   {failure}", file=sys.stderr)
+        return 1
+    print("\n✅ Sincronizzazione incrementale conforme", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Suite di benchmark riproducibile sui percorsi reali di api, products, models e ui
+
+Avvia un server locale che simula /api/v1/products e misura, per ogni scenario,
+throughput, percentili di latenza e memoria di picco. Il risultato è un JSON;
+con --compare viene confrontato con una baseline salvata e ogni regressione oltre
+la tolleranza fa terminare il processo con codice 1.
+
+Uso:
+    python -m benchmarks.run                                  # stampa il JSON dei risultati
+    python -m benchmarks.run --save-baseline                  # aggiorna benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.3
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import api
+import cache
+import products
+from benchmarks.stub_server import make_product
+from models import product_models
+from render import write_products
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Percentile q (0-100) con il metodo nearest-rank"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * q / 100) - 1)]
+
+
+def measure(run_once: Callable[[], int], iterations: int) -> dict[str, float]:
+    """Esegue lo scenario `iterations` volte, poi una volta sotto tracemalloc per la memoria di picco"""
+    latencies = []
+    items = run_once()  # riscaldamento: connessioni e import non entrano nella misura
+    for _ in range(iterations):
+        gc.collect()
+        start = time.perf_counter()
+        run_once()
+        latencies.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run_once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        # Throughput sull'iterazione più veloce: il rumore della macchina può solo rallentare
+        "throughput_items_s": round(items / min(latencies), 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, any]:
+    """Esegue tutti gli scenari contro il server locale e restituisce i risultati"""
+    random.seed(args.seed)
+    raw_catalog = [make_product(i) for i in range(1, args.cpu_size + 1)]
+    catalog = product_models(raw_catalog)
+    product_ids = [str(i) for i in range(1, args.ids + 1)]
+
+    # Il server gira in un processo separato: tracemalloc e GIL misurano solo il client
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_server", "--size", str(args.size), "--latency", str(args.latency),
+         "--jitter", str(args.jitter), "--error-rate", str(args.error_rate), "--seed", str(args.seed)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        products.BASE_URL = stub.stdout.readline().strip()
+        api.reset_session()
+
+        def list_fetch() -> int:
+            cache.response_cache.invalidate()
+            return len(products.get_all_products())
+
+        def paged_fetch() -> int:
+            return sum(1 for _ in products.iter_products(page_size=args.page_size))
+
+        def by_id_fetch() -> int:
+            cache.response_cache.invalidate()
+            results = products.get_products_by_ids(product_ids, concurrency=args.concurrency)
+            return sum(1 for result in results if result["error"] is None)
+
+        def validation() -> int:
+            return len(product_models(raw_catalog))
+
+        def render_table() -> int:
+            with open(os.devnull, "w") as devnull:
+                return write_products(catalog, devnull, "table")
+
+        scenarios = {
+            "list_fetch": list_fetch,
+            "paged_fetch": paged_fetch,
+            "by_id_fetch": by_id_fetch,
+            "validation": validation,
+            "render_table": render_table,
+        }
+        selected = args.scenarios or list(scenarios)
+        results = {}
+        for name in selected:
+            print(f"→ {name}", file=sys.stderr)
+            results[name] = measure(scenarios[name], args.iterations)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    return {
+        "config": {
+            key: getattr(args, key)
+            for key in ("size", "cpu_size", "ids", "latency", "jitter", "error_rate", "seed", "iterations", "concurrency", "page_size")
+        },
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "scenarios": results,
+    }
+
+
+# Metriche confrontate con la baseline: True se un valore più alto è migliore
+COMPARED_METRICS: dict[str, bool] = {
+    "throughput_items_s": True,
+    "peak_memory_kb": False,
+}
+
+
+def compare(results: dict[str, any], baseline: dict[str, any], tolerance: float) -> list[str]:
+    """Restituisce le regressioni rispetto alla baseline oltre la tolleranza relativa"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference[metric], current[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{name}.{metric}: {old} → {new} ({change:+.0%}, tolleranza ±{tolerance:.0%})")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark riproducibile con server Fake Store locale",
+    )
+    parser.add_argument("--size", type=int, default=2000, help="prodotti nel catalogo sintetico")
+    parser.add_argument("--cpu-size", type=int, default=50_000, help="prodotti per validation e render_table")
+    parser.add_argument("--ids", type=int, default=200, help="ID recuperati nello scenario by_id_fetch")
+    parser.add_argument("--latency", type=float, default=0.002, help="latenza del server in secondi")
+    parser.add_argument("--jitter", type=float, default=0.002, help="latenza aggiuntiva casuale massima")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="frazione di risposte 503 iniettate")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="+", help="sottoinsieme di scenari da eseguire")
+    parser.add_argument("--output", "-o", help="file JSON dei risultati (predefinito: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON con cui confrontare i risultati")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="regressione relativa ammessa (0.3 = 30%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"salva i risultati in {BASELINE_PATH}")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    logging.disable(logging.CRITICAL)
+
+    results = run_suite(args)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Baseline salvata in {BASELINE_PATH}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("⚠️  Configurazione diversa dalla baseline: il confronto potrebbe non essere significativo", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSIONI RISPETTO ALLA BASELINE:", file=sys.stderr)
+            for regression in regressions:
+                print(f"   {regression}", file=sys.stderr)
+            return 1
+        print("✅ Nessuna regressione rispetto alla baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Server HTTP locale che simula gli endpoint /api/v1/products"""
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import chain, islice
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES: list[str] = ["Clothes", "Electronics", "Furniture", "Shoes", "Miscellaneous"]
+
+
+def make_product(product_id: int) -> dict[str, any]:
+    """Genera un prodotto sintetico con la stessa struttura dell'API reale"""
+    category_id = product_id % len(CATEGORIES)
+    return {
+        "id": product_id,
+        "title": f"Prodotto sintetico {product_id}",
+        "price": round(5 + (product_id * 37 % 1000) / 10, 2),
+        "description": f"Descrizione del prodotto {product_id} generata per i benchmark locali",
+        "category": {"id": category_id + 1, "name": CATEGORIES[category_id]},
+        "images": [f"https://example.invalid/{product_id}.jpg"],
+        "creationAt": "2026-01-01T00:00:00.000Z",
+        "updatedAt": "2026-01-01T00:00:00.000Z",
+    }
+
+
+class StubServer:
+    """Server di prova con catalogo sintetico, latenza e iniezione di errori configurabili"""
+
+    def __init__(
+        self, size: int = 100, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+    ) -> None:
+        self.size = size
+        self.overrides: dict[int, dict[str, any]] = {}
+        self.deleted: set[int] = set()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.down = False
+        self.requests = 0
+        self.not_modified = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """URL dell'endpoint dei prodotti esposto dal server"""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v1/products"
+
+    def start(self) -> "StubServer":
+        """Avvia il server in un thread in background"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arresta il server e libera la porta"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def get_product(self, product_id: int) -> dict[str, any] | None:
+        """Restituisce il prodotto con l'ID indicato, generandolo al volo"""
+        if product_id in self.deleted:
+            return None
+        if product_id in self.overrides:
+            return self.overrides[product_id]
+        if 1 <= product_id <= self.size:
+            return make_product(product_id)
+        return None
+
+    def update_product(self, product_id: int, **changes) -> dict[str, any]:
+        """Modifica (o crea) un prodotto aggiornandone updatedAt"""
+        product = dict(self.get_product(product_id) or make_product(product_id))
+        product.update(changes)
+        product["updatedAt"] = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        self.deleted.discard(product_id)
+        self.overrides[product_id] = product
+        return product
+
+    def delete_product(self, product_id: int) -> None:
+        """Rimuove un prodotto dal catalogo"""
+        self.overrides.pop(product_id, None)
+        self.deleted.add(product_id)
+
+    def iter_products(self, offset: int = 0, limit: int | None = None):
+        """Scorre il catalogo in ordine di ID senza materializzarlo"""
+        extra_ids = sorted(i for i in self.overrides if i > self.size)
+        if not self.deleted and not extra_ids:
+            # Nessun buco negli ID: la pagina si calcola direttamente
+            stop = self.size if limit is None else min(self.size, offset + limit)
+            return (self.get_product(i) for i in range(offset + 1, stop + 1))
+
+        product_ids = chain(range(1, self.size + 1), extra_ids)
+        live = (p for p in map(self.get_product, product_ids) if p is not None)
+        return islice(live, offset, None if limit is None else offset + limit)
+
+    def handle(self, path: str) -> tuple[int, any]:
+        """Risolve un percorso nella coppia (status, corpo JSON)"""
+        url = urlsplit(path)
+        parts = url.path.rstrip("/").split("/")
+        if parts[1:4] != ["api", "v1", "products"]:
+            return 404, {"message": "Not Found"}
+        if len(parts) == 4:
+            query = parse_qs(url.query)
+            try:
+                offset = int(query.get("offset", ["0"])[0])
+                limit = int(query["limit"][0]) if "limit" in query else None
+            except ValueError:
+                return 400, {"message": "Bad Request"}
+            if offset < 0 or (limit is not None and limit < 0):
+                return 400, {"message": "Bad Request"}
+            return 200, list(self.iter_products(offset, limit))
+        if len(parts) == 5 and not parts[4].isdigit():
+            return 400, {"message": "Bad Request"}
+        if len(parts) == 5:
+            product = self.get_product(int(parts[4]))
+            if product is not None:
+                return 200, product
+        return 404, {"message": "Not Found"}
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.requests += 1
+                    inject_error = stub.down or stub._random.random() < stub.error_rate
+                    if inject_error:
+                        stub.injected_errors += 1
+                    delay = stub.latency + (stub._random.uniform(0, stub.jitter) if stub.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if inject_error:
+                    status, payload = 503, {"message": "Service Unavailable"}
+                else:
+                    status, payload = stub.handle(self.path)
+                body = json.dumps(payload).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main() -> None:
+    """Avvia il server da riga di comando e stampa l'URL base"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Server locale che simula l'API Fake Store")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubServer(
+        size=args.size, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed,
+    ).start()
+    print(stub.base_url, flush=True)
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
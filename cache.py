@@ -0,0 +1,144 @@
+"""Modulo cache delle risposte API (LRU in memoria con TTL e livello su disco opzionale)"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from api import fetch_data
+from config import logger, CACHE_TTL, CACHE_MAX_ENTRIES, CACHE_DIR
+
+
+class ResponseCache:
+    """Cache LRU con scadenza per voce e rivalidazione tramite ETag/Last-Modified"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL, disk_dir: str | None = CACHE_DIR) -> None:
+        if max_entries < 1:
+            raise ValueError("La cache deve contenere almeno una voce")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._entries: OrderedDict[str, dict[str, any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0, "disk_hits": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, URL: str) -> any:
+        """Restituisce i dati per l'URL, dalla cache se validi o rivalidandoli sul server"""
+        entry = self._lookup(URL)
+        if entry is not None and entry["expires"] > time.time():
+            self._count("hits")
+            return entry["data"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, data, response_headers = fetch_data(URL, headers or None)
+        if status == 304 and entry is not None:
+            self._count("revalidated")
+            logger.info(f"Cache rivalidata (304) per {URL}")
+            data = entry["data"]
+        else:
+            self._count("misses")
+
+        self._store(URL, {
+            "data": data,
+            "etag": response_headers.get("ETag") or (entry or {}).get("etag"),
+            "last_modified": response_headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+            "expires": time.time() + self.ttl,
+        })
+        return data
+
+    def invalidate(self, URL: str | None = None) -> None:
+        """Rimuove una voce, o tutta la cache se l'URL non è indicato"""
+        with self._lock:
+            if URL:
+                self._entries.pop(URL, None)
+            else:
+                self._entries.clear()
+
+        if self.disk_dir:
+            if URL:
+                paths = [self._disk_path(URL)]
+            else:
+                paths = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith(".json")]
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        logger.info(f"Cache invalidata: {URL or 'tutte le voci'}")
+
+    def stats(self) -> dict[str, int]:
+        """Restituisce i contatori di hit, miss, rivalidazioni ed espulsioni"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, URL: str) -> dict[str, any] | None:
+        with self._lock:
+            entry = self._entries.get(URL)
+            if entry is not None:
+                self._entries.move_to_end(URL)
+                return entry
+
+        entry = self._disk_read(URL)
+        if entry is not None:
+            self._count("disk_hits")
+            self._store(URL, entry, persist=False)
+        return entry
+
+    def _store(self, URL: str, entry: dict[str, any], persist: bool = True) -> None:
+        with self._lock:
+            self._entries[URL] = entry
+            self._entries.move_to_end(URL)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        if persist:
+            self._disk_write(URL, entry)
+
+    def _disk_path(self, URL: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(URL.encode()).hexdigest() + ".json")
+
+    def _disk_read(self, URL: str) -> dict[str, any] | None:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(URL), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Voce della cache su disco illeggibile per {URL}: {e}")
+            return None
+
+    def _disk_write(self, URL: str, entry: dict[str, any]) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(URL)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Impossibile scrivere la cache su disco per {URL}: {e}")
+
+
+response_cache = ResponseCache()
+
+
+def get_cached_data(URL: str) -> dict[str, any] | list[dict[str, any]]:
+    """Recupera i dati dall'API passando per la cache condivisa"""
+    return response_cache.get(URL)
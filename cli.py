@@ -0,0 +1,193 @@
+"""Modulo per la modalità a riga di comando non interattiva (script, cron, pipeline)"""
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable, Iterator
+
+from requests import exceptions
+
+import metrics
+from config import logger, PAGE_SIZE, POOL_MAXSIZE
+from models import Product
+from products import iter_products, get_products_by_ids
+from render import FORMATS, write_products
+
+EXIT_OK: int = 0
+EXIT_PARTIAL: int = 1
+EXIT_USAGE: int = 2
+EXIT_UPSTREAM: int = 3
+
+
+def _read_ids(values: list[str]) -> Iterator[str]:
+    """Restituisce gli ID indicati; '-' li legge da stdin, uno o più per riga"""
+    for value in values:
+        if value == "-":
+            for line in sys.stdin:
+                yield from line.replace(",", " ").split()
+        else:
+            yield value
+
+
+def _chunks(items: Iterator[str], size: int) -> Iterator[list[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """Scrive l'intero catalogo su stdout, pagina per pagina"""
+    count = write_products(iter_products(page_size=args.page_size), sys.stdout, args.format)
+    logger.info(f"Scritti {count} prodotti")
+    return EXIT_OK
+
+
+def _is_upstream_error(error: BaseException | None) -> bool:
+    """Indica se l'errore dipende dal server o dalla rete (connessione, timeout, 5xx, circuito aperto)"""
+    if isinstance(error, (exceptions.ConnectionError, exceptions.Timeout)):
+        return True
+    cause = getattr(error, "__cause__", None)
+    return isinstance(cause, exceptions.HTTPError) and cause.response is not None and cause.response.status_code >= 500
+
+
+def _fetch_products(product_ids: Iterator[str], concurrency: int, failures: dict[str, list[str]]) -> Iterator[Product]:
+    """Recupera gli ID a blocchi in parallelo, restituendo i prodotti trovati nell'ordine richiesto
+
+    Gli ID non recuperati finiscono in failures["upstream"] o failures["partial"] secondo la causa.
+    """
+    # I blocchi mantengono l'output in streaming anche con molti ID da stdin
+    for chunk in _chunks(product_ids, concurrency * 8):
+        for result in get_products_by_ids(chunk, concurrency=concurrency):
+            if result["error"]:
+                kind = "upstream" if _is_upstream_error(result["exception"]) else "partial"
+                failures[kind].append(result["id"])
+                print(f"{result['id']}: {result['error']}", file=sys.stderr)
+            else:
+                yield result["product"]
+
+
+def cmd_get(args: argparse.Namespace) -> int:
+    """Recupera i prodotti indicati in parallelo e li scrive nell'ordine richiesto"""
+    failures: dict[str, list[str]] = {"upstream": [], "partial": []}
+    write_products(_fetch_products(_read_ids(args.ids), args.concurrency, failures), sys.stdout, args.format)
+    if failures["upstream"]:
+        return EXIT_UPSTREAM
+    return EXIT_PARTIAL if failures["partial"] else EXIT_OK
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Esporta l'intero catalogo su file o stdout"""
+    if args.output in (None, "-"):
+        count = write_products(iter_products(page_size=args.page_size), sys.stdout, args.format)
+    else:
+        # File temporaneo: un export interrotto non sovrascrive quello precedente
+        tmp_path = f"{args.output}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                count = write_products(iter_products(page_size=args.page_size), f, args.format)
+            os.replace(tmp_path, args.output)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    logger.info(f"Esportati {count} prodotti")
+    return EXIT_OK
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("deve essere un intero positivo")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Costruisce il parser dei sottocomandi"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Fake Store: senza argomenti avvia il menu interattivo",
+        epilog=(
+            f"codici di uscita: {EXIT_OK} successo, {EXIT_PARTIAL} alcuni ID non trovati o non validi, "
+            f"{EXIT_USAGE} argomenti non validi, {EXIT_UPSTREAM} errore del server o di connessione"
+        ),
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra i log informativi su stderr")
+    parser.add_argument("--profile", action="store_true", help="misura tempi e traffico e stampa un riepilogo all'uscita")
+    parser.add_argument("--log-json", action="store_true", help="scrive i log come JSON strutturato su una riga")
+    subparsers = parser.add_subparsers(dest="command")
+
+    list_parser = subparsers.add_parser("list", help="elenca tutti i prodotti")
+    list_parser.add_argument("--format", choices=FORMATS, default="table")
+    list_parser.add_argument("--page-size", type=_positive_int, default=PAGE_SIZE)
+    list_parser.set_defaults(handler=cmd_list)
+
+    get_parser = subparsers.add_parser("get", help="recupera uno o più prodotti per ID ('-' legge gli ID da stdin)")
+    get_parser.add_argument("ids", nargs="+", metavar="ID")
+    get_parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    get_parser.add_argument("--concurrency", type=_positive_int, default=POOL_MAXSIZE)
+    get_parser.set_defaults(handler=cmd_get)
+
+    export_parser = subparsers.add_parser("export", help="esporta l'intero catalogo")
+    export_parser.add_argument("--format", choices=("csv", "jsonl"), default="jsonl")
+    export_parser.add_argument("--output", "-o", help="file di destinazione (predefinito: stdout)")
+    export_parser.add_argument("--page-size", type=_positive_int, default=PAGE_SIZE)
+    export_parser.set_defaults(handler=cmd_export)
+
+    return parser
+
+
+def _print_profile(log_json: bool) -> None:
+    """Scrive su stderr il riepilogo delle metriche raccolte"""
+    if log_json:
+        print(json.dumps({"profile": metrics.summary()}), file=sys.stderr)
+    else:
+        print(metrics.format_summary(), file=sys.stderr)
+
+
+def run(argv: list[str], interactive: Callable[[], None] | None = None) -> int:
+    """Esegue un sottocomando (o il menu `interactive` se assente) e restituisce il codice di uscita"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None and interactive is None:
+        parser.error("specificare un comando")
+
+    if args.log_json:
+        metrics.enable_json_logging()
+    if args.profile:
+        metrics.enable()
+    if args.command is not None and not args.verbose:
+        # Gli errori vengono riportati su stderr da questo modulo, senza duplicarli nei log
+        logging.getLogger().setLevel(logging.CRITICAL)
+
+    try:
+        if args.command is None:
+            interactive()
+            return EXIT_OK
+        return args.handler(args)
+
+    except BrokenPipeError:
+        # Il lettore (es. `head`) ha chiuso la pipe: non è un errore
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return EXIT_OK
+
+    except (exceptions.ConnectionError, exceptions.Timeout) as e:
+        print(f"Errore di connessione: {e}", file=sys.stderr)
+        return EXIT_UPSTREAM
+
+    except ValueError as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return EXIT_UPSTREAM
+
+    except OSError as e:
+        print(f"Errore di scrittura: {e}", file=sys.stderr)
+        return EXIT_UPSTREAM
+
+    finally:
+        if args.profile:
+            _print_profile(args.log_json)
@@ -3,6 +3,38 @@ import logging
 
 BASE_URL: str = "https://api.escuelajs.co/api/v1/products"
 
+# Configurazione sessione HTTP
+CONNECT_TIMEOUT: float = 3.05
+READ_TIMEOUT: float = 5
+POOL_CONNECTIONS: int = 4
+POOL_MAXSIZE: int = 16
+MAX_RETRIES: int = 3
+BACKOFF_FACTOR: float = 0.3
+BACKOFF_MAX: float = 5
+
+# Configurazione circuit breaker verso il server
+BREAKER_FAILURE_RATE: float = 0.5
+BREAKER_MIN_REQUESTS: int = 10
+BREAKER_WINDOW: int = 20
+BREAKER_RESET_TIMEOUT: float = 30
+LAST_GOOD_MAX_ENTRIES: int = 256
+
+# Configurazione paginazione del catalogo
+PAGE_SIZE: int = 50
+
+# Configurazione cache delle risposte
+CACHE_TTL: float = 60
+CACHE_MAX_ENTRIES: int = 256
+CACHE_DIR: str | None = None  # es. ".cache" per ripartire con la cache già popolata
+
+# Configurazione snapshot SQLite del catalogo
+SNAPSHOT_PATH: str | None = None  # es. "catalog.sqlite3" per sincronizzare il catalogo in locale
+SNAPSHOT_MAX_AGE: float = 300
+
+# Configurazione rendering
+RENDER_CHUNK_ROWS: int = 1000
+RENDER_PAGE_ROWS: int = 40
+
 # Configurazione logging
 logging.basicConfig(
     level=logging.INFO,
@@ -1,11 +1,39 @@
 """Modulo principale - punto di ingresso dell'applicazione"""
+import sys
+
+from cli import run
 from config import logger
-from ui import menu_principale, print_lista_prodotti, print_prodotto
-from products import get_all_products, get_product_by_id
+from ui import menu_principale, menu_ordinamento, print_lista_prodotti, print_prodotto
+from products import iter_products, get_product_by_id, get_products_by_ids
+from store import get_catalog_store
+from sync import get_snapshot
+
+
+def _parse_price(value: str) -> float | None:
+    """Converte un prezzo inserito dall'utente; stringa vuota significa nessun limite"""
+    if not value:
+        return None
+    try:
+        return float(value.replace(",", "."))
+    except ValueError:
+        raise ValueError(f"Prezzo non valido: {value}") from None
+
+
+def _sync_snapshot() -> None:
+    """Aggiorna lo snapshot locale del catalogo, se configurato e non più recente"""
+    snapshot = get_snapshot()
+    if snapshot is None or snapshot.is_fresh():
+        return
+    try:
+        snapshot.sync()
+    except Exception as e:
+        # Senza sincronizzazione l'applicazione continua a usare la rete
+        logger.warning(f"Sincronizzazione dello snapshot non riuscita: {type(e).__name__} - {e}")
 
 
 def main() -> None:
     """Funzione principale con gestione errori robusta"""
+    _sync_snapshot()
     while True:
         try:
             choice = menu_principale()
@@ -13,8 +41,7 @@ def main() -> None:
             if choice == "1":
                 # Visualizza lista completa
                 logger.info("Utente ha scelto: visualizza lista completa")
-                products = get_all_products()
-                print_lista_prodotti(products)
+                print_lista_prodotti(iter_products())
                 
                 # Chiedi di visualizzare i dettagli di un prodotto
                 product_id = input("Inserisci l'ID di un prodotto per visualizzare i dettagli (o premi Invio per tornare al menu): ").strip()
@@ -31,12 +58,24 @@ def main() -> None:
             elif choice == "2":
                 # Cerca un prodotto per ID
                 logger.info("Utente ha scelto: cerca per ID")
-                user_input = input("Inserisci l'id del prodotto da visualizzare: ").strip()
-                
+                user_input = input("Inserisci l'id del prodotto da visualizzare (più ID separati da spazio): ").strip()
+
                 # Validazione input
                 if not user_input:
                     raise ValueError("ID non può essere vuoto")
-                
+
+                product_ids = user_input.replace(",", " ").split()
+                if len(product_ids) > 1:
+                    # Più ID: recupero concorrente, errori riportati per singolo ID
+                    for result in get_products_by_ids(product_ids):
+                        if result["error"]:
+                            print(f"❌ Errore per l'ID {result['id']}: {result['error']}")
+                        else:
+                            print()
+                            print_prodotto(result["product"])
+                    logger.info(f"Visualizzati {len(product_ids)} prodotti")
+                    continue
+
                 try:
                     product = get_product_by_id(user_input)
                     print()
@@ -46,12 +85,37 @@ def main() -> None:
                     print(f"❌ Errore di validazione: {e}")
             
             elif choice == "3":
+                # Ricerca per parola chiave sul catalogo locale
+                logger.info("Utente ha scelto: cerca per parola chiave")
+                query = input("Inserisci una o più parole chiave: ").strip()
+                if not query:
+                    raise ValueError("La ricerca non può essere vuota")
+                print_lista_prodotti(get_catalog_store().search(query, sort=menu_ordinamento()))
+
+            elif choice == "4":
+                # Filtro per categoria sul catalogo locale
+                logger.info("Utente ha scelto: filtra per categoria")
+                store = get_catalog_store()
+                print(f"Categorie disponibili: {', '.join(store.categories())}")
+                category = input("Inserisci la categoria: ").strip()
+                if not category:
+                    raise ValueError("La categoria non può essere vuota")
+                print_lista_prodotti(store.by_category(category, sort=menu_ordinamento()))
+
+            elif choice == "5":
+                # Filtro per fascia di prezzo sul catalogo locale
+                logger.info("Utente ha scelto: filtra per prezzo")
+                min_price = _parse_price(input("Prezzo minimo (Invio per nessun limite): ").strip())
+                max_price = _parse_price(input("Prezzo massimo (Invio per nessun limite): ").strip())
+                print_lista_prodotti(get_catalog_store().price_range(min_price, max_price, sort=menu_ordinamento()))
+
+            elif choice == "6":
                 print("\n👋 Arrivederci!\n")
                 logger.info("Utente ha chiuso l'applicazione")
                 break
             
             else:
-                print("❌ Opzione non valida. Seleziona 1, 2 o 3.\n")
+                print("❌ Opzione non valida. Seleziona un numero da 1 a 6.\n")
                 logger.warning(f"Opzione non valida selezionata: {choice}")
         
         except ValueError as e:
@@ -72,4 +136,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    # Con un sottocomando: modalità non interattiva (es. `python main.py export --format jsonl`)
+    sys.exit(run(sys.argv[1:], interactive=main))
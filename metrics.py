@@ -0,0 +1,203 @@
+"""Modulo di strumentazione: span temporizzati, istogrammi di latenza e contatori HTTP"""
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from config import logger
+
+# Istogramma logaritmico: 8 bucket per raddoppio (~9% di precisione), valori in microsecondi
+_BUCKETS_PER_OCTAVE: int = 8
+
+_enabled: bool = False
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Istogramma di latenze a bucket logaritmici, a memoria costante"""
+
+    def __init__(self) -> None:
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        """Registra una durata in secondi"""
+        micros = max(seconds * 1_000_000, 1.0)
+        self.buckets[int(math.log2(micros) * _BUCKETS_PER_OCTAVE)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Stima in secondi il percentile q (0-100), come limite superiore del bucket"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * q / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE) / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.total, 6),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_spans: dict[str, Histogram] = {}
+_http_status: Counter[str] = Counter()
+_http_errors: Counter[str] = Counter()
+_http_bytes: int = 0
+
+
+def enable() -> None:
+    """Attiva la raccolta delle metriche"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Disattiva la raccolta delle metriche"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Indica se la raccolta delle metriche è attiva"""
+    return _enabled
+
+
+def reset() -> None:
+    """Azzera tutte le metriche raccolte"""
+    global _http_bytes
+    with _lock:
+        _spans.clear()
+        _http_status.clear()
+        _http_errors.clear()
+        _http_bytes = 0
+
+
+def record_span(name: str, seconds: float, error: bool = False) -> None:
+    """Registra la durata di una chiamata nello span indicato"""
+    with _lock:
+        histogram = _spans.get(name)
+        if histogram is None:
+            histogram = _spans[name] = Histogram()
+        histogram.record(seconds, error)
+    logger.debug("span", extra={"span": name, "duration_ms": round(seconds * 1000, 3), "error": error})
+
+
+def span(name: str) -> Callable:
+    """Decoratore che misura ogni chiamata; se le metriche sono disattive costa solo un controllo"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record_span(name, time.perf_counter() - start, error=True)
+                raise
+            record_span(name, time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
+
+
+def record_response(status_code: int, size: int) -> None:
+    """Conta una risposta HTTP per codice di stato e i byte ricevuti"""
+    global _http_bytes
+    if not _enabled:
+        return
+    with _lock:
+        _http_status[str(status_code)] += 1
+        _http_bytes += size
+        if status_code >= 400:
+            _http_errors[str(status_code)] += 1
+
+
+def record_http_error(kind: str) -> None:
+    """Conta un errore HTTP senza risposta (timeout, connessione)"""
+    if not _enabled:
+        return
+    with _lock:
+        _http_errors[kind] += 1
+
+
+def summary() -> dict[str, any]:
+    """Restituisce un riepilogo serializzabile delle metriche raccolte"""
+    with _lock:
+        return {
+            "spans": {name: histogram.to_dict() for name, histogram in sorted(_spans.items())},
+            "http": {
+                "responses_by_status": dict(_http_status),
+                "errors": dict(_http_errors),
+                "bytes": _http_bytes,
+            },
+        }
+
+
+def format_summary(data: dict[str, any] | None = None) -> str:
+    """Formatta il riepilogo come tabella di testo"""
+    data = data or summary()
+    lines = [
+        "",
+        "=" * 96,
+        f"{'SPAN':<32} {'CHIAMATE':>9} {'ERRORI':>7} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9} {'TOTALE s':>10}",
+        "=" * 96,
+    ]
+    for name, stats in data["spans"].items():
+        lines.append(
+            f"{name:<32} {stats['count']:>9} {stats['errors']:>7} {stats['p50_ms']:>9.3f} "
+            f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['total_s']:>10.3f}"
+        )
+    http = data["http"]
+    lines.append("=" * 96)
+    lines.append(f"HTTP: {sum(http['responses_by_status'].values())} risposte, {http['bytes']:,} byte")
+    if http["responses_by_status"]:
+        lines.append("  per stato: " + ", ".join(f"{k}={v}" for k, v in sorted(http["responses_by_status"].items())))
+    if http["errors"]:
+        lines.append("  errori: " + ", ".join(f"{k}={v}" for k, v in sorted(http["errors"].items())))
+    lines.append("")
+    return "\n".join(lines)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter che scrive ogni record di log come oggetto JSON su una riga"""
+
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self._RESERVED})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def enable_json_logging() -> None:
+    """Sostituisce il formato dei log con JSON strutturato su una riga"""
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(JsonFormatter())
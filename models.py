@@ -1,14 +1,43 @@
 """Modulo per la trasformazione e validazione dei dati dei prodotti"""
+import itertools
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import metrics
 from config import logger
 
+REQUIRED_FIELDS: tuple[str, ...] = ("id", "title", "price", "category", "description")
+
+# Tipi ammessi per ogni campo (category è il nome della categoria): indici e snapshot SQLite ne dipendono
+FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "id": (int,),
+    "title": (str,),
+    "price": (int, float),
+    "category": (str,),
+    "description": (str,),
+}
+
+# Combinazioni valide dei tipi esatti dei campi, nell'ordine di REQUIRED_FIELDS, per il controllo in blocco
+_VALID_TYPES: frozenset[tuple[type, ...]] = frozenset(itertools.product(*(FIELD_TYPES[field] for field in REQUIRED_FIELDS)))
+
+
+@dataclass(slots=True)
+class Product:
+    """Modello interno di un prodotto"""
+    id: int
+    title: str
+    price: float
+    category: str
+    description: str
 
-def product_model(product: dict[str, any]) -> dict[str, any]:
+
+@metrics.span("models.product_model")
+def product_model(product: dict[str, any]) -> Product:
     """Trasforma il prodotto API nel modello interno"""
-    required_fields = ["id", "title", "price", "category", "description"]
-    
     try:
         # Validazione campi obbligatori
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in product:
                 raise KeyError(f"Campo obbligatorio mancante: {field}")
         
@@ -16,13 +45,13 @@ def product_model(product: dict[str, any]) -> dict[str, any]:
         if not isinstance(product["category"], dict) or "name" not in product["category"]:
             raise ValueError("Struttura category non valida")
         
-        return {
-            "id": product["id"], 
-            "title": product["title"], 
-            "price": product["price"], 
-            "category": product["category"]["name"],
-            "description": product["description"]
-        }
+        # Validazione tipi dei campi
+        values = _field_values(product)
+        type_error = _type_error(values)
+        if type_error:
+            raise ValueError(type_error)
+        
+        return Product(*values)
     
     except KeyError as e:
         error_msg = f"Errore nei dati del prodotto: {e}"
@@ -33,3 +62,71 @@ def product_model(product: dict[str, any]) -> dict[str, any]:
         error_msg = f"Errore nella validazione del prodotto: {e}"
         logger.error(error_msg)
         raise
+
+
+def _field_values(product: dict[str, any]) -> tuple[any, ...]:
+    """Estrae i valori dei campi nell'ordine di REQUIRED_FIELDS"""
+    return (
+        product["id"],
+        product["title"],
+        product["price"],
+        product["category"]["name"],
+        product["description"],
+    )
+
+
+def _type_error(values: tuple[any, ...]) -> str | None:
+    """Descrive il primo campo con un tipo non ammesso, o None se i tipi sono validi"""
+    for field, value in zip(REQUIRED_FIELDS, values):
+        if type(value) not in FIELD_TYPES[field]:
+            return f"Tipo non valido per il campo {field}: {type(value).__name__}"
+    return None
+
+
+def _rejection_reason(product: any) -> str:
+    """Descrive perché un prodotto API non può essere convertito"""
+    if not isinstance(product, dict):
+        return "Prodotto non è un oggetto"
+    for field in REQUIRED_FIELDS:
+        if field not in product:
+            return f"Campo obbligatorio mancante: {field}"
+    if not isinstance(product["category"], dict) or "name" not in product["category"]:
+        return "Struttura category non valida"
+    return _type_error(_field_values(product)) or "Prodotto non valido"
+
+
+@metrics.span("models.product_models")
+def product_models(
+    products: Iterable[dict[str, any]],
+    errors: list[dict[str, any]] | None = None,
+) -> list[Product]:
+    """Valida un blocco di prodotti API in un solo passaggio, saltando quelli non validi
+
+    Se `errors` è una lista, vi vengono aggiunti i prodotti scartati con il motivo.
+    """
+    result = []
+    append = result.append
+    intern = sys.intern
+    rejected = 0
+
+    for index, product in enumerate(products):
+        # Percorso rapido: nessun controllo esplicito, i prodotti malformati finiscono nell'except
+        try:
+            product_id = product["id"]
+            title = product["title"]
+            price = product["price"]
+            category = product["category"]["name"]
+            description = product["description"]
+            # Stesse regole di product_model: un solo lookup sulle combinazioni di tipi ammesse
+            if (type(product_id), type(title), type(price), type(category), type(description)) not in _VALID_TYPES:
+                raise TypeError
+            append(Product(product_id, title, price, intern(category), description))
+        except (KeyError, TypeError):
+            rejected += 1
+            if errors is not None:
+                product_id = product.get("id", "N/A") if isinstance(product, dict) else "N/A"
+                errors.append({"index": index, "id": product_id, "error": _rejection_reason(product)})
+
+    if rejected:
+        logger.warning(f"Prodotti non validi scartati: {rejected}")
+    return result
@@ -1,14 +1,20 @@
 """Modulo per le operazioni sui prodotti (business logic)"""
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
 from api import get_data
-from config import logger, BASE_URL
-from models import product_model
+from cache import get_cached_data
+from config import logger, BASE_URL, POOL_MAXSIZE, PAGE_SIZE
+from models import Product, product_model, product_models
+from sync import get_snapshot
 
 
 def get_all_products() -> list[dict[str, any]]:
     """Recupera la lista completa dei prodotti dall'API"""
     try:
         logger.info("Recupero della lista completa dei prodotti")
-        products = get_data(BASE_URL)
+        products = get_cached_data(BASE_URL)
         
         if not isinstance(products, list):
             raise ValueError("Risposta API non è una lista")
@@ -27,7 +33,46 @@ def get_all_products() -> list[dict[str, any]]:
         raise ValueError(error_msg) from e
 
 
-def get_product_by_id(product_id: str) -> dict[str, any]:
+def _get_page(offset: int, limit: int) -> list[dict[str, any]]:
+    """Recupera una pagina grezza del catalogo"""
+    page = get_data(f"{BASE_URL}?offset={offset}&limit={limit}")
+    if not isinstance(page, list):
+        raise ValueError("Risposta API non è una lista")
+    return page
+
+
+def iter_products(page_size: int = PAGE_SIZE) -> Iterator[Product]:
+    """Scorre il catalogo pagina per pagina, scaricando la successiva in anticipo"""
+    if page_size < 1:
+        raise ValueError("La dimensione della pagina deve essere almeno 1")
+
+    logger.info(f"Recupero paginato dei prodotti (pagine da {page_size})")
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        offset = 0
+        next_page = executor.submit(_get_page, offset, page_size)
+        while True:
+            try:
+                page = next_page.result()
+            except ValueError as e:
+                error_msg = f"Errore nel recupero della pagina (offset {offset}): {e}"
+                logger.error(error_msg)
+                raise ValueError(error_msg) from e
+
+            # Solo una pagina vuota indica la fine: il server può ridurre o ignorare il limite
+            if not page:
+                logger.info(f"Recuperati {offset} prodotti in modalità paginata")
+                return
+
+            offset += len(page)
+            next_page = executor.submit(_get_page, offset, page_size)
+
+            yield from product_models(page)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_product_by_id(product_id: str) -> Product:
     """Recupera un singolo prodotto per ID"""
     try:
         if not product_id.isdigit():
@@ -35,7 +80,15 @@ def get_product_by_id(product_id: str) -> dict[str, any]:
         
         logger.info(f"Richiesta per il prodotto ID: {product_id}")
         
-        raw_product = get_data(f"{BASE_URL}/{product_id}")
+        # Snapshot locale recente: nessuna richiesta di rete
+        snapshot = get_snapshot()
+        if snapshot is not None and snapshot.is_fresh():
+            product = snapshot.get(int(product_id))
+            if product is not None:
+                logger.info(f"Prodotto {product_id} servito dallo snapshot locale")
+                return product
+        
+        raw_product = get_cached_data(f"{BASE_URL}/{product_id}")
         product = product_model(raw_product)
         
         logger.info(f"Prodotto {product_id} recuperato con successo")
@@ -44,3 +97,33 @@ def get_product_by_id(product_id: str) -> dict[str, any]:
     except ValueError as e:
         logger.warning(f"Errore nel recupero del prodotto {product_id}: {e}")
         raise
+
+
+async def get_products_by_ids_async(product_ids: list[str], concurrency: int = POOL_MAXSIZE) -> list[dict[str, any]]:
+    """Recupera più prodotti in parallelo, restituendo un esito per ogni ID nell'ordine di input
+
+    Ogni esito contiene l'ID, il prodotto o il messaggio d'errore e l'eccezione originale.
+    """
+    if concurrency < 1:
+        raise ValueError("La concorrenza deve essere almeno 1")
+
+    logger.info(f"Recupero di {len(product_ids)} prodotti con concorrenza {concurrency}")
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        async def fetch(product_id: str) -> dict[str, any]:
+            async with semaphore:
+                try:
+                    product = await loop.run_in_executor(executor, get_product_by_id, str(product_id))
+                    return {"id": product_id, "product": product, "error": None, "exception": None}
+                except Exception as e:
+                    return {"id": product_id, "product": None, "error": str(e) or type(e).__name__, "exception": e}
+
+        return await asyncio.gather(*(fetch(product_id) for product_id in product_ids))
+
+
+def get_products_by_ids(product_ids: list[str], concurrency: int = POOL_MAXSIZE) -> list[dict[str, any]]:
+    """Versione sincrona di get_products_by_ids_async"""
+    return asyncio.run(get_products_by_ids_async(product_ids, concurrency))
@@ -0,0 +1,204 @@
+"""Modulo di rendering bufferizzato per liste e dettagli dei prodotti"""
+import csv
+import io
+import json
+import sys
+import unicodedata
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+import metrics
+from config import RENDER_CHUNK_ROWS
+from models import Product
+
+FORMATS: tuple[str, ...] = ("table", "csv", "jsonl")
+TABLE_WIDTH: int = 80
+ID_WIDTH: int = 5
+TITLE_WIDTH: int = 75
+
+_VARIATION_SELECTOR_EMOJI = "\ufe0f"
+_ZERO_WIDTH_JOINER = "\u200d"
+_SKIN_TONE_FIRST = "\U0001f3fb"
+_SKIN_TONE_LAST = "\U0001f3ff"
+
+
+def char_width(char: str) -> int:
+    """Colonne occupate da un carattere su terminale (0, 1 o 2)"""
+    if unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf"):
+        return 0
+    if _SKIN_TONE_FIRST <= char <= _SKIN_TONE_LAST:
+        # I modificatori del tono della pelle si fondono con l'emoji che li precede
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def _char_widths(text: str) -> Iterable[int]:
+    """Larghezza di ogni carattere del testo, nell'ordine"""
+    previous = 0
+    joined = False
+    for char in text:
+        if joined:
+            # Dopo uno zero-width joiner la sequenza (es. 👨‍👩‍👧) occupa le colonne della prima emoji
+            width = 0
+        elif char == _VARIATION_SELECTOR_EMOJI and previous == 1:
+            # Il selettore di variazione rende emoji (quindi larghi) i simboli che lo precedono
+            width = 1
+        else:
+            width = char_width(char)
+        joined = char == _ZERO_WIDTH_JOINER
+        previous = width
+        yield width
+
+
+def display_width(text: str) -> int:
+    """Larghezza visualizzata di un testo, considerando caratteri larghi ed emoji"""
+    if text.isascii():
+        return len(text)
+    return sum(_char_widths(text))
+
+
+def fit(text: str, width: int) -> str:
+    """Tronca con '...' e riempie di spazi in modo che il testo occupi esattamente `width` colonne"""
+    if text.isascii():
+        return text[:width - 3] + "..." if len(text) > width else text.ljust(width)
+    text_width = display_width(text)
+    if text_width > width:
+        limit = width - 3
+        used = 0
+        end = 0
+        for end, char_cols in enumerate(_char_widths(text)):
+            if used + char_cols > limit:
+                break
+            used += char_cols
+        text = text[:end] + "..."
+        text_width = used + 3
+    return text + " " * (width - text_width)
+
+
+def wrap(text: str, width: int, indent: str = "") -> list[str]:
+    """Spezza il testo in righe di al massimo `width` colonne (rientro incluso)"""
+    lines = []
+    current: list[str] = []
+    used = display_width(indent)
+    base = used
+    for word in text.split():
+        word_width = display_width(word)
+        if current and used + 1 + word_width > width:
+            lines.append(indent + " ".join(current))
+            current = []
+            used = base
+        used += word_width + (1 if current else 0)
+        current.append(word)
+    if current:
+        lines.append(indent + " ".join(current))
+    return lines
+
+
+@metrics.span("render.render_detail")
+def render_detail(product: Product) -> str:
+    """Costruisce in un unico buffer la scheda di dettaglio di un prodotto"""
+    separator = "=" * TABLE_WIDTH
+    parts = [
+        "",
+        separator,
+        f"{'DETTAGLI PRODOTTO':^{TABLE_WIDTH}}",
+        separator,
+        "",
+        f"🆔  ID: {product.id}",
+        "",
+        "📦 TITOLO:",
+        f"   {product.title}",
+        "",
+        f"🏷️  CATEGORIA: {product.category}",
+        "",
+        f"💰 PREZZO: €{product.price:.2f}",
+        "",
+        "📝 DESCRIZIONE:",
+        *wrap(product.description, TABLE_WIDTH - 4, indent="   "),
+        "",
+        separator,
+        "",
+        "",
+    ]
+    return "\n".join(parts)
+
+
+def product_dict(product: Product) -> dict[str, any]:
+    """Converte un Product in dizionario serializzabile"""
+    return {
+        "id": product.id,
+        "title": product.title,
+        "price": product.price,
+        "category": product.category,
+        "description": product.description,
+    }
+
+
+def _table_header() -> str:
+    separator = "=" * TABLE_WIDTH
+    return f"\n{separator}\n{'ID':<{ID_WIDTH}} {'TITOLO':<{TITLE_WIDTH}}\n{separator}\n"
+
+
+def _table_row(product: Product) -> str:
+    return f"{product.id:<{ID_WIDTH}} {fit(product.title, TITLE_WIDTH)}\n"
+
+
+def _table_footer(count: int, interrupted: bool = False) -> str:
+    # Un elenco interrotto non conosce il totale: si riportano solo le righe mostrate
+    summary = f"Prodotti mostrati: {count} (elenco interrotto)" if interrupted else f"Totale prodotti: {count}"
+    return f"{'=' * TABLE_WIDTH}\n{summary}\n\n"
+
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+@metrics.span("render.write_products")
+def write_products(
+    products: Iterable[Product],
+    stream: TextIO | None = None,
+    fmt: str = "table",
+    page_rows: int | None = None,
+    on_page: Callable[[], bool] | None = None,
+) -> int:
+    """Scrive i prodotti nel formato indicato a blocchi di righe, restituendo quante ne ha scritte
+
+    Con `page_rows` e `on_page` la scrittura si ferma ogni `page_rows` righe e prosegue
+    solo se `on_page()` restituisce True.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato non valido: {fmt} (disponibili: {', '.join(FORMATS)})")
+    stream = stream or sys.stdout
+    buffer = io.StringIO()
+
+    if fmt == "table":
+        buffer.write(_table_header())
+        write_row = lambda product: buffer.write(_table_row(product))
+    elif fmt == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(("id", "title", "price", "category", "description"))
+        write_row = lambda p: writer.writerow((p.id, p.title, p.price, p.category, p.description))
+    else:
+        encode = _json_encoder.encode
+        write_row = lambda product: buffer.write(encode(product_dict(product)) + "\n")
+
+    count = 0
+    interrupted = False
+    for product in products:
+        write_row(product)
+        count += 1
+        end_of_page = bool(page_rows and on_page and count % page_rows == 0)
+        if end_of_page or count % RENDER_CHUNK_ROWS == 0:
+            stream.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+        if end_of_page:
+            stream.flush()
+            if not on_page():
+                interrupted = True
+                break
+
+    if fmt == "table":
+        buffer.write(_table_footer(count, interrupted))
+    stream.write(buffer.getvalue())
+    stream.flush()
+    return count
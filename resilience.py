@@ -0,0 +1,121 @@
+"""Modulo di resilienza verso il server: coalescenza delle richieste e circuit breaker"""
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from requests import exceptions
+
+from config import logger
+
+
+class CircuitOpenError(exceptions.ConnectionError):
+    """Il circuito verso il server è aperto: la richiesta non è stata inviata"""
+
+
+class SingleFlight:
+    """Condivide un'unica esecuzione tra chiamate concorrenti con la stessa chiave"""
+
+    class _Call:
+        __slots__ = ("done", "result", "error")
+
+        def __init__(self) -> None:
+            self.done = threading.Event()
+            self.result = None
+            self.error: BaseException | None = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[any, SingleFlight._Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: any, func: Callable[[], any]) -> any:
+        """Esegue func, o attende e riusa l'esito di un'esecuzione già in corso per la stessa chiave"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class CircuitBreaker:
+    """Circuit breaker a finestra mobile con stati chiuso, aperto e semi-aperto"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate: float, min_requests: int, window: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.short_circuited = 0
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Indica se la richiesta può partire; nello stato semi-aperto lascia passare una sola sonda"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                logger.info(f"Circuito {self.name} semi-aperto: invio di una richiesta di prova")
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        """Registra una risposta valida dal server"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                logger.info(f"Circuito {self.name} richiuso: il server risponde di nuovo")
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            self._probing = False
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Registra un errore del server (timeout, connessione, 5xx) e apre il circuito oltre la soglia"""
+        with self._lock:
+            self._probing = False
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if self.state == self.HALF_OPEN or (
+                len(self._outcomes) >= self.min_requests
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuito {self.name} aperto: {failures}/{len(self._outcomes)} errori recenti")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Libera lo slot della sonda senza registrare un esito"""
+        with self._lock:
+            self._probing = False
@@ -0,0 +1,146 @@
+"""Modulo per il catalogo locale indicizzato (ricerca, filtri e ordinamento senza rete)"""
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+from requests import exceptions
+
+from config import logger
+from models import Product, product_models
+from products import get_all_products
+from sync import get_snapshot
+
+_TOKEN_RE = re.compile(r"\w+")
+
+SORT_KEYS = {
+    "id": (lambda product: product.id, False),
+    "price": (lambda product: product.price, False),
+    "-price": (lambda product: product.price, True),
+    "title": (lambda product: product.title.casefold(), False),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Divide un testo in parole normalizzate per l'indice di ricerca"""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class CatalogStore:
+    """Catalogo in memoria con indici per ID, prezzo, categoria e parole chiave"""
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        self._by_id: dict[int, Product] = {}
+        self._prices: list[float] = []
+        self._price_products: list[Product] = []
+        self._by_category: dict[str, list[Product]] = {}
+        self._by_category_price: dict[str, list[Product]] = {}
+        self._by_token: dict[str, set[int]] = {}
+        self.load(products)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def load(self, products: Iterable[Product]) -> None:
+        """Ricostruisce tutti gli indici a partire dai prodotti indicati"""
+        by_id = {product.id: product for product in products}
+        by_price = sorted(by_id.values(), key=lambda product: (product.price, product.id))
+        by_category: dict[str, list[Product]] = {}
+        by_token: dict[str, set[int]] = {}
+
+        for product_id, product in by_id.items():
+            by_category.setdefault(product.category.casefold(), []).append(product)
+            for token in set(tokenize(product.title)) | set(tokenize(product.description)):
+                by_token.setdefault(token, set()).add(product_id)
+
+        # Seconda vista per categoria già in ordine di prezzo, per evitare sort a ogni query
+        by_category_price: dict[str, list[Product]] = {}
+        for product in by_price:
+            by_category_price.setdefault(product.category.casefold(), []).append(product)
+
+        self._by_id = by_id
+        self._prices = [product.price for product in by_price]
+        self._price_products = by_price
+        self._by_category = by_category
+        self._by_category_price = by_category_price
+        self._by_token = by_token
+        logger.info(f"Catalogo locale indicizzato: {len(by_id)} prodotti, {len(by_token)} parole")
+
+    def get(self, product_id: int) -> Product | None:
+        """Restituisce il prodotto con l'ID indicato, se presente"""
+        return self._by_id.get(product_id)
+
+    def categories(self) -> list[str]:
+        """Restituisce i nomi delle categorie presenti nel catalogo"""
+        names = {products[0].category for products in self._by_category.values()}
+        return sorted(names, key=str.casefold)
+
+    def price_range(self, min_price: float | None = None, max_price: float | None = None, sort: str | None = None) -> list[Product]:
+        """Prodotti con prezzo compreso tra min_price e max_price (estremi inclusi)"""
+        start = 0 if min_price is None else bisect_left(self._prices, min_price)
+        stop = len(self._prices) if max_price is None else bisect_right(self._prices, max_price)
+        return self._sorted(self._price_products[start:stop], sort)
+
+    def by_category(self, category: str, sort: str | None = None) -> list[Product]:
+        """Prodotti della categoria indicata (senza distinzione tra maiuscole e minuscole)"""
+        key = category.strip().casefold()
+        if sort in ("price", "-price"):
+            products = self._by_category_price.get(key, [])
+            return products[::-1] if sort == "-price" else list(products)
+        return self._sorted(list(self._by_category.get(key, [])), sort)
+
+    def search(self, query: str, sort: str | None = None) -> list[Product]:
+        """Prodotti che contengono tutte le parole della query in titolo o descrizione"""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        postings = sorted((self._by_token.get(token, set()) for token in tokens), key=len)
+        matches = set(postings[0]).intersection(*postings[1:])
+        return self._sorted([self._by_id[product_id] for product_id in sorted(matches)], sort)
+
+    @staticmethod
+    def _sorted(products: list[Product], sort: str | None) -> list[Product]:
+        """Ordina sul posto i risultati secondo la chiave indicata (None lascia l'ordine dell'indice)"""
+        if sort is not None:
+            if sort not in SORT_KEYS:
+                raise ValueError(f"Ordinamento non valido: {sort}")
+            key, reverse = SORT_KEYS[sort]
+            products.sort(key=key, reverse=reverse)
+        return products
+
+
+_store: CatalogStore | None = None
+_store_source: any = None
+_store_lock = threading.Lock()
+
+
+def get_catalog_store(refresh: bool = False) -> CatalogStore:
+    """Restituisce il catalogo locale condiviso, ricostruendolo quando cambiano i dati di origine
+
+    L'origine è lo snapshot se recente, altrimenti la lista della cache delle risposte:
+    il catalogo non è quindi mai più vecchio di SNAPSHOT_MAX_AGE o CACHE_TTL.
+    """
+    global _store, _store_source
+    with _store_lock:
+        snapshot = get_snapshot()
+        if snapshot is not None and snapshot.is_fresh():
+            source = ("snapshot", snapshot.last_change())
+            changed = source != _store_source
+            load = snapshot.products
+        else:
+            try:
+                source = get_all_products()
+            except (ValueError, exceptions.RequestException) as e:
+                if _store is None:
+                    raise
+                logger.warning(f"Catalogo locale non aggiornato, uso la versione precedente: {e}")
+                return _store
+            # La cache restituisce la stessa lista finché la voce è valida o rivalidata con 304
+            changed = source is not _store_source
+            load = lambda: product_models(source)
+
+        if _store is None or refresh or changed:
+            logger.info("Costruzione del catalogo locale")
+            _store = CatalogStore(load())
+            _store_source = source
+        return _store
@@ -0,0 +1,185 @@
+"""Modulo di sincronizzazione incrementale del catalogo su snapshot SQLite"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from api import fetch_data
+from config import logger, BASE_URL, SNAPSHOT_PATH, SNAPSHOT_MAX_AGE
+from models import FIELD_TYPES, Product, product_models
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    price REAL NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    version TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def product_version(product: dict[str, any]) -> str:
+    """Identifica la versione di un prodotto API: updatedAt se presente, altrimenti un hash del contenuto"""
+    updated_at = product.get("updatedAt") or product.get("creationAt")
+    if updated_at:
+        return f"ts:{updated_at}"
+    content = json.dumps(product, sort_keys=True, separators=(",", ":"))
+    return "sha1:" + hashlib.sha1(content.encode()).hexdigest()
+
+
+class CatalogSnapshot:
+    """Copia locale persistente del catalogo, aggiornata solo dove qualcosa è cambiato"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Chiude la connessione al database"""
+        with self._lock:
+            self._conn.close()
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def last_sync(self) -> float | None:
+        """Istante (epoch) dell'ultima sincronizzazione riuscita"""
+        with self._lock:
+            value = self._get_meta("last_sync")
+        return float(value) if value else None
+
+    def last_change(self) -> float | None:
+        """Istante (epoch) dell'ultima scrittura di prodotti nello snapshot"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(synced_at) FROM products").fetchone()[0]
+
+    def is_fresh(self, max_age: float = SNAPSHOT_MAX_AGE) -> bool:
+        """Indica se lo snapshot è abbastanza recente da essere usato al posto della rete"""
+        last_sync = self.last_sync()
+        return last_sync is not None and time.time() - last_sync <= max_age
+
+    def sync(self, URL: str = BASE_URL) -> dict[str, any]:
+        """Allinea lo snapshot al server scrivendo solo le righe nuove, modificate o rimosse"""
+        with self._lock:
+            etag = self._get_meta("etag")
+            last_modified = self._get_meta("last_modified")
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        status, raw_products, response_headers = fetch_data(URL, headers or None)
+        now = time.time()
+
+        if status == 304:
+            with self._lock, self._conn:
+                self._set_meta("last_sync", str(now))
+            logger.info("Snapshot del catalogo già aggiornato (304)")
+            return {"status": "not_modified", "inserted": 0, "updated": 0, "deleted": 0, "unchanged": len(self)}
+
+        if not isinstance(raw_products, list):
+            raise ValueError("Risposta API non è una lista")
+
+        versions = {}
+        for raw_product in raw_products:
+            # Le righe con un ID non valido vengono scartate da product_models
+            if isinstance(raw_product, dict) and type(raw_product.get("id")) in FIELD_TYPES["id"]:
+                versions[raw_product["id"]] = product_version(raw_product)
+        products = {product.id: product for product in product_models(raw_products)}
+
+        with self._lock, self._conn:
+            stored = dict(self._conn.execute("SELECT id, version FROM products WHERE deleted = 0"))
+
+            changed = [product for product_id, product in products.items() if stored.get(product_id) != versions[product_id]]
+            removed = [(now, product_id) for product_id in stored.keys() - products.keys()]
+
+            self._conn.executemany(
+                """
+                INSERT INTO products (id, title, price, category, description, version, deleted, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, 0, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title, price = excluded.price, category = excluded.category,
+                    description = excluded.description, version = excluded.version,
+                    deleted = 0, synced_at = excluded.synced_at
+                """,
+                [
+                    (p.id, p.title, p.price, p.category, p.description, versions[p.id], now)
+                    for p in changed
+                ],
+            )
+            self._conn.executemany("UPDATE products SET deleted = 1, synced_at = ? WHERE id = ?", removed)
+
+            for key, value in (("etag", response_headers.get("ETag")), ("last_modified", response_headers.get("Last-Modified"))):
+                if value:
+                    self._set_meta(key, value)
+            self._set_meta("last_sync", str(now))
+
+        inserted = sum(1 for product in changed if product.id not in stored)
+        stats = {
+            "status": "updated",
+            "inserted": inserted,
+            "updated": len(changed) - inserted,
+            "deleted": len(removed),
+            "unchanged": len(products) - len(changed),
+        }
+        logger.info(
+            f"Snapshot sincronizzato: {stats['inserted']} nuovi, {stats['updated']} modificati, "
+            f"{stats['deleted']} rimossi, {stats['unchanged']} invariati"
+        )
+        return stats
+
+    def get(self, product_id: int) -> Product | None:
+        """Restituisce un prodotto attivo dello snapshot"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, title, price, category, description FROM products WHERE id = ? AND deleted = 0",
+                (product_id,),
+            ).fetchone()
+        return Product(*row) if row else None
+
+    def products(self) -> list[Product]:
+        """Restituisce tutti i prodotti attivi dello snapshot in ordine di ID"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, price, category, description FROM products WHERE deleted = 0 ORDER BY id"
+            ).fetchall()
+        return [Product(*row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products WHERE deleted = 0").fetchone()[0]
+
+
+_snapshot: CatalogSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> CatalogSnapshot | None:
+    """Restituisce lo snapshot condiviso, o None se SNAPSHOT_PATH non è configurato"""
+    global _snapshot
+    if not SNAPSHOT_PATH:
+        return None
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = CatalogSnapshot(SNAPSHOT_PATH)
+        return _snapshot
@@ -1,43 +1,21 @@
 """Modulo per le operazioni di visualizzazione e interfaccia utente"""
-from config import logger
-from models import product_model
+import sys
+from collections.abc import Iterable
 
+import metrics
+from config import logger, RENDER_PAGE_ROWS
+from models import Product
+from render import render_detail, write_products
 
-def print_prodotto(product: dict[str, any]) -> None:
+
+@metrics.span("ui.print_prodotto")
+def print_prodotto(product: Product) -> None:
     """Stampa i dettagli del prodotto in formato professionale"""
     try:
-        print("\n" + "=" * 80)
-        print(f"{'DETTAGLI PRODOTTO':^80}")
-        print("=" * 80)
-        
-        print(f"\n🆔  ID: {product['id']}")
-        print("\n📦 TITOLO:")
-        print(f"   {product['title']}")
-        
-        print(f"\n🏷️  CATEGORIA: {product['category']}")
-        
-        print(f"\n💰 PREZZO: €{product['price']:.2f}")
-        
-        print("\n📝 DESCRIZIONE:")
-        # Stampa la descrizione con word wrap
-        description = product['description']
-        max_width = 76
-        words = description.split()
-        current_line = "   "
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_width:
-                current_line += word + " "
-            else:
-                print(current_line)
-                current_line = "   " + word + " "
-        
-        if current_line.strip() != "":
-            print(current_line)
+        sys.stdout.write(render_detail(product))
+        sys.stdout.flush()
         
-        print("\n" + "=" * 80 + "\n")
-        
-    except KeyError as e:
+    except AttributeError as e:
         error_msg = f"Errore: Campo mancante nel prodotto - {e}"
         logger.error(error_msg)
         raise ValueError(error_msg) from e
@@ -47,26 +25,18 @@ def print_prodotto(product: dict[str, any]) -> None:
         raise
 
 
-def print_lista_prodotti(products: list[dict[str, any]]) -> None:
-    """Stampa la lista dei prodotti mostrando solo ID e titolo"""
+def _continua_pagina() -> bool:
+    """Chiede se proseguire con la pagina successiva della lista"""
+    return input("-- Invio per continuare, q per interrompere -- ").strip().lower() != "q"
+
+
+@metrics.span("ui.print_lista_prodotti")
+def print_lista_prodotti(products: Iterable[Product], page_rows: int | None = None) -> None:
+    """Stampa la lista dei prodotti mostrando solo ID e titolo, a pagine se l'output è un terminale"""
     try:
-        print("\n" + "=" * 80)
-        print(f"{'ID':<5} {'TITOLO':<75}")
-        print("=" * 80)
-        
-        for idx, product in enumerate(products, 1):
-            try:
-                product_data = product_model(product)
-                title = product_data["title"]
-                if len(title) > 75:
-                    title = title[:72] + "..."
-                print(f"{product_data['id']:<5} {title:<75}")
-            except ValueError:
-                logger.warning(f"Prodotto non valido, saltato: ID {product.get('id', 'N/A')}")
-                continue
-        
-        print("=" * 80)
-        print(f"Totale prodotti: {len(products)}\n")
+        if page_rows is None and sys.stdout.isatty():
+            page_rows = RENDER_PAGE_ROWS
+        write_products(products, sys.stdout, "table", page_rows=page_rows, on_page=_continua_pagina)
     
     except Exception as e:
         error_msg = f"Errore nella stampa della lista: {e}"
@@ -81,8 +51,20 @@ def menu_principale() -> str:
     print("=" * 40)
     print("1. Visualizza lista completa prodotti")
     print("2. Cerca un prodotto per ID")
-    print("3. Esci")
+    print("3. Cerca per parola chiave")
+    print("4. Filtra per categoria")
+    print("5. Filtra per fascia di prezzo")
+    print("6. Esci")
     print("=" * 40)
     
-    choice = input("Seleziona un'opzione (1-3): ").strip()
+    choice = input("Seleziona un'opzione (1-6): ").strip()
     return choice
+
+
+def menu_ordinamento() -> str:
+    """Chiede l'ordinamento dei risultati e restituisce la chiave corrispondente"""
+    options = {"1": "id", "2": "price", "3": "-price", "4": "title"}
+    choice = input("Ordina per: 1) ID  2) prezzo crescente  3) prezzo decrescente  4) titolo [1]: ").strip() or "1"
+    if choice not in options:
+        raise ValueError("Ordinamento non valido")
+    return options[choice]